@@ -1,16 +1,32 @@
 # ChromaTone: Skin Tone Analysis and Color Recommendation System
 # Google Colab Compatible Python Code
 
+import functools
+import os
+import sys
+import types
 import pandas as pd
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from skimage.color import rgb2lab, lab2rgb
+import matplotlib
+if not os.environ.get('DISPLAY'):
+    # Headless session (CI, Colab batch cells): render off-screen
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 from collections import defaultdict
 import warnings
 warnings.filterwarnings('ignore')
 
+# numba is optional: when available, large palettes go through a fused
+# parallel kernel instead of the multi-pass NumPy path
+try:
+    from numba import njit, prange
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
+
 # Skin Tone Scale Mapping
 SKIN_TONE_SCALE = {
     1: {'name': 'Porcelain', 'hex': '#f6ede4', 'lightness_range': (85, 100)},
@@ -62,126 +78,314 @@ OUTFIT_EXAMPLES = {
     ]
 }
 
+# Freeze the recommendation tables: tuples are smaller than lists and cannot
+# be mutated by callers, and interning the strings turns every downstream
+# equality/hash check into a pointer comparison
+for _rec in UPPER_WEAR_RECOMMENDATIONS.values():
+    _rec['colors'] = tuple(sys.intern(c) for c in _rec['colors'])
+    _rec['undertones'] = tuple(sys.intern(u) for u in _rec['undertones'])
+OUTFIT_EXAMPLES = {k: tuple(sys.intern(s) for s in v)
+                   for k, v in OUTFIT_EXAMPLES.items()}
+
+# Lookup table mapping ASCII codes of hex digits to their nibble values
+_HEX_NIBBLE_LUT = np.zeros(256, dtype=np.uint8)
+_HEX_NIBBLE_LUT[ord('0'):ord('9') + 1] = np.arange(10)
+_HEX_NIBBLE_LUT[ord('a'):ord('f') + 1] = np.arange(10, 16)
+_HEX_NIBBLE_LUT[ord('A'):ord('F') + 1] = np.arange(10, 16)
+
+def hex_to_rgb_batch(hex_colors):
+    """Convert a sequence of '#rrggbb' strings to an (N, 3) uint8 RGB array.
+
+    Parses every hex digit at once through a 256-entry nibble lookup table
+    instead of calling int(..., 16) per channel per color.
+    """
+    buf = np.frombuffer(
+        ''.join(c.lstrip('#') for c in hex_colors).encode('ascii'),
+        dtype=np.uint8
+    ).reshape(-1, 6)
+    hi = _HEX_NIBBLE_LUT[buf[:, 0::2]]
+    lo = _HEX_NIBBLE_LUT[buf[:, 1::2]]
+    return (hi << 4) | lo
+
 def hex_to_rgb(hex_color):
     """Convert hex color to RGB values"""
-    hex_color = hex_color.lstrip('#')
-    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+    r, g, b = hex_to_rgb_batch([hex_color])[0]
+    return int(r), int(g), int(b)
+
+# Above this size the fused numba kernel beats the multi-pass NumPy path,
+# which allocates several full-size temporaries
+_NUMBA_DISPATCH_THRESHOLD = 256
+
+if _HAVE_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _rgb_to_hsl_numba(rgb_u8, out):
+        """Fused RGB->HSL kernel: one pass per color, no temporaries"""
+        for i in prange(rgb_u8.shape[0]):
+            r = rgb_u8[i, 0] / 255.0
+            g = rgb_u8[i, 1] / 255.0
+            b = rgb_u8[i, 2] / 255.0
+            mx = max(r, g, b)
+            mn = min(r, g, b)
+            l = (mx + mn) / 2
+            if mx == mn:
+                h = 0.0
+                s = 0.0
+            else:
+                d = mx - mn
+                s = d / (2 - mx - mn) if l > 0.5 else d / (mx + mn)
+                if mx == r:
+                    h = (g - b) / d + (6 if g < b else 0)
+                elif mx == g:
+                    h = (b - r) / d + 2
+                else:
+                    h = (r - g) / d + 4
+                h /= 6
+            out[i, 0] = h * 360
+            out[i, 1] = s * 100
+            out[i, 2] = l * 100
+
+def rgb_to_hsl_batch(rgb_u8):
+    """Convert an (N, 3) uint8 RGB array to an (N, 3) HSL array.
+
+    Returns hue in degrees [0, 360) and saturation/lightness in [0, 100],
+    computed with vectorized NumPy operations instead of per-color Python math.
+    Large batches dispatch to the fused numba kernel when numba is installed.
+    """
+    rgb_u8 = np.asarray(rgb_u8, dtype=np.uint8)
+    if _HAVE_NUMBA and rgb_u8.shape[0] > _NUMBA_DISPATCH_THRESHOLD:
+        out = np.empty(rgb_u8.shape, dtype=np.float32)
+        _rgb_to_hsl_numba(rgb_u8, out)
+        return out
+
+    # Max/min/delta stay in the integer domain (0-255 scale); floats only
+    # enter for the final normalizing divisions, which halves the bytes
+    # moved through the bound part of the kernel
+    rgb = rgb_u8.astype(np.int16)
+    r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+
+    mx = rgb.max(axis=1)
+    mn = rgb.min(axis=1)
+    d = mx - mn
+    total = mx + mn
+    chromatic = d != 0
+    l = total * np.float32(100.0 / 510.0)
+
+    # Saturation: divide only where the color is not a pure grey.
+    # l > 0.5 on the unit scale is total > 255 on the 0-510 integer scale.
+    s = np.zeros_like(l)
+    denom = np.where(total > 255, 510 - total, total).astype(np.float32)
+    np.divide(d.astype(np.float32) * 100, denom, out=s, where=chromatic)
+
+    # Hue: pick the formula for whichever channel holds the maximum
+    inv_d = np.zeros_like(l)
+    np.divide(1.0, d, out=inv_d, where=chromatic)
+    h = np.select(
+        [mx == r, mx == g],
+        [(g - b) * inv_d + np.where(g < b, np.float32(6), np.float32(0)),
+         (b - r) * inv_d + 2],
+        default=(r - g) * inv_d + 4
+    )
+    h = np.where(chromatic, h * np.float32(60.0), 0)
+
+    return np.stack([h, s, l], axis=1)
 
 def rgb_to_hsl(r, g, b):
     """Convert RGB to HSL"""
-    r, g, b = r/255.0, g/255.0, b/255.0
-    max_val = max(r, g, b)
-    min_val = min(r, g, b)
-    h, s, l = 0, 0, (max_val + min_val) / 2
+    h, s, l = rgb_to_hsl_batch(np.array([[r, g, b]], dtype=np.uint8))[0]
+    return h, s, l
 
-    if max_val == min_val:
-        h = s = 0  # achromatic
-    else:
-        d = max_val - min_val
-        s = d / (2 - max_val - min_val) if l > 0.5 else d / (max_val + min_val)
-        if max_val == r:
-            h = (g - b) / d + (6 if g < b else 0)
-        elif max_val == g:
-            h = (b - r) / d + 2
-        elif max_val == b:
-            h = (r - g) / d + 4
-        h /= 6
-
-    return h * 360, s * 100, l * 100
+# Lightness range lower bounds and tone names, sorted ascending by lightness
+# (i.e. descending by level) so the scale can be searched in O(log N)
+_TONE_MIN = np.array([SKIN_TONE_SCALE[level]['lightness_range'][0]
+                      for level in range(10, 0, -1)])
+_TONE_NAMES = np.array([SKIN_TONE_SCALE[level]['name']
+                        for level in range(10, 0, -1)])
+
+def determine_skin_tone_level_batch(lightness):
+    """Map an array of lightness values to (levels, tone names) arrays"""
+    idx = np.searchsorted(_TONE_MIN, lightness, side='right') - 1
+    idx = np.clip(idx, 0, len(_TONE_MIN) - 1)
+    return 10 - idx, _TONE_NAMES[idx]
 
 def determine_skin_tone_level(lightness):
     """Map lightness value to skin tone level"""
-    for level, data in SKIN_TONE_SCALE.items():
-        min_l, max_l = data['lightness_range']
-        if min_l <= lightness < max_l:
-            return level, data['name']
-    return 10, 'Ebony'  # Default to darkest
+    levels, names = determine_skin_tone_level_batch(np.atleast_1d(lightness))
+    return int(levels[0]), str(names[0])
+
+# Undertone labels indexed by class code (0=warm, 1=cool, 2=neutral)
+_UNDERTONE_NAMES = np.array(['warm', 'cool', 'neutral'])
+_UNDERTONE_DESCRIPTIONS = np.array(['Golden/Yellow', 'Pink/Red', 'Balanced'])
+
+# Degree-resolution hue -> undertone code table; warm is written last so it
+# wins the shared hue=20 boundary, matching the original branch order
+_HUE_LUT = np.full(361, 2, dtype=np.uint8)
+_HUE_LUT[0:21] = 1
+_HUE_LUT[300:361] = 1
+_HUE_LUT[20:51] = 0
+
+def determine_undertone_batch(hue):
+    """Classify an array of hues into (undertone types, descriptions) arrays.
+
+    Classification happens at whole-degree resolution through a precomputed
+    361-entry lookup table: one clip, one cast, one gather, no branches.
+    """
+    codes = _HUE_LUT[np.clip(np.asarray(hue).astype(np.int64), 0, 360)]
+    return _UNDERTONE_NAMES[codes], _UNDERTONE_DESCRIPTIONS[codes]
 
 def determine_undertone(hue):
     """Determine skin undertone based on hue"""
-    if 20 <= hue <= 50:
-        return 'warm', 'Golden/Yellow'
-    elif hue >= 300 or hue <= 20:
-        return 'cool', 'Pink/Red'
-    else:
-        return 'neutral', 'Balanced'
+    types, descriptions = determine_undertone_batch(np.atleast_1d(hue))
+    return str(types[0]), str(descriptions[0])
+
+@functools.lru_cache(maxsize=1024)
+def _analyze_skin_tone_cached(hex_colors):
+    """Cached analysis over a hashable (sorted) tuple of hex colors"""
+    # Single array pipeline: hex -> RGB -> HSL -> per-channel mean, with no
+    # intermediate Python lists or tuple unpacking along the way
+    hsl_values = rgb_to_hsl_batch(hex_to_rgb_batch(hex_colors))
+    avg_hue, _, avg_lightness = hsl_values.mean(axis=0)
 
-def analyze_skin_tone_from_colors(dominant_colors):
-    """Analyze skin tone from dominant colors extracted from image"""
-    hsl_values = []
-    
-    for hex_color in dominant_colors:
-        r, g, b = hex_to_rgb(hex_color)
-        h, s, l = rgb_to_hsl(r, g, b)
-        hsl_values.append((h, s, l))
-    
-    # Calculate average values
-    avg_hue = np.mean([h for h, s, l in hsl_values])
-    avg_lightness = np.mean([l for h, s, l in hsl_values])
-    
     # Determine skin tone characteristics
     level, tone_name = determine_skin_tone_level(avg_lightness)
     undertone_type, undertone_desc = determine_undertone(avg_hue)
-    
-    return {
+
+    # Read-only view so callers cannot mutate the cached entry
+    return types.MappingProxyType({
         'skin_tone_level': level,
         'skin_tone_name': tone_name,
         'undertone_type': undertone_type,
         'undertone_description': undertone_desc,
-        'lightness': avg_lightness,
-        'hue': avg_hue
-    }
+        'lightness': float(avg_lightness),
+        'hue': float(avg_hue)
+    })
+
+# Below this many pixels full KMeans with Elkan's algorithm is fast enough;
+# larger images go through MiniBatchKMeans
+_MINIBATCH_PIXEL_THRESHOLD = 10000
+
+# Dominant colors are statistically stable under random subsampling, and
+# palette quality plateaus around 20-50k samples, so clustering never needs
+# more pixels than this even for HD images
+_MAX_CLUSTER_SAMPLES = 50000
+
+def extract_dominant_colors(img_rgb, k=5):
+    """Extract the k dominant colors of an RGB image as hex strings.
+
+    Clusters the pixels in CIELAB space, where Euclidean distance roughly
+    tracks perceptual difference, using KMeans (Elkan's algorithm for small
+    images, MiniBatchKMeans for large ones) and returns the cluster centers
+    ordered by cluster size. Initial centroids are the pixels sitting at
+    evenly spaced lightness quantiles, so runs are deterministic and start
+    well spread across the image's tonal range.
+    """
+    pixels = np.asarray(img_rgb).reshape(-1, 3).astype(np.float32)
+
+    # Cluster a random subsample of large images: KMeans cost is O(N * k) per
+    # iteration and the centers barely move past ~50k pixels
+    if pixels.shape[0] > _MAX_CLUSTER_SAMPLES:
+        keep = np.random.default_rng(0).choice(pixels.shape[0],
+                                               _MAX_CLUSTER_SAMPLES,
+                                               replace=False)
+        pixels = pixels[keep]
 
+    lab = rgb2lab(pixels.reshape(-1, 1, 3) / 255.0).reshape(-1, 3).astype(np.float32)
+
+    # Seed centroids from actual pixels at spread-out lightness quantiles
+    order = np.argsort(lab[:, 0])
+    seed_idx = order[(np.linspace(0.05, 0.95, k) * (lab.shape[0] - 1)).astype(int)]
+    init = lab[seed_idx]
+
+    if lab.shape[0] > _MINIBATCH_PIXEL_THRESHOLD:
+        kmeans = MiniBatchKMeans(n_clusters=k, batch_size=1024, n_init=1,
+                                 max_iter=50, init=init, random_state=0)
+    else:
+        kmeans = KMeans(n_clusters=k, algorithm='elkan', n_init=1,
+                        init=init, random_state=0)
+    labels = kmeans.fit_predict(lab)
+
+    # Order centers from most to least populated cluster, back in RGB
+    counts = np.bincount(labels, minlength=k)
+    lab_centers = kmeans.cluster_centers_[np.argsort(-counts)]
+    centers = lab2rgb(lab_centers.reshape(1, -1, 3)).reshape(-1, 3) * 255
+    centers = np.clip(np.rint(centers), 0, 255).astype(np.uint8)
+
+    return ['#{:02x}{:02x}{:02x}'.format(r, g, b) for r, g, b in centers]
+
+def analyze_skin_tone_from_colors(dominant_colors):
+    """Analyze skin tone from dominant colors extracted from image"""
+    # The averages are order-invariant, so sorting makes palettes that differ
+    # only in color order hit the same cache entry
+    return _analyze_skin_tone_cached(tuple(sorted(dominant_colors)))
+
+@functools.lru_cache(maxsize=None)
 def get_upper_wear_recommendations(undertone_type):
     """Get upper wear color recommendations based on undertone"""
     return UPPER_WEAR_RECOMMENDATIONS[undertone_type]['colors']
 
+@functools.lru_cache(maxsize=None)
 def get_outfit_examples(undertone_type):
     """Get outfit examples based on undertone"""
     return OUTFIT_EXAMPLES[undertone_type][:2]  # Return top 2 examples
 
+# The sample dataset only depends on the constant SKIN_TONE_SCALE and
+# recommendation tables, so build it once at import time
+_PRECOMPUTED_ROWS = [
+    {
+        'Skin_Tone_Name': SKIN_TONE_SCALE[level]['name'],
+        'Skin_Tone_Level': level,
+        'Undertone_Type': undertone,
+        'Upper_Wear_Colors': ', '.join(get_upper_wear_recommendations(undertone)),
+        'Example_Outfit_Ideas': ' | '.join(get_outfit_examples(undertone))
+    }
+    for level in range(1, 11)
+    for undertone in ['warm', 'cool', 'neutral']
+]
+_SAMPLE_DF = pd.DataFrame(_PRECOMPUTED_ROWS)
+
+# Structure-of-arrays companion to the sample dataset: every row's color list
+# as a matrix of int16 codes into a shared vocabulary, so analysis can count
+# colors with bincount instead of re-splitting CSV strings per row
+# Vocabulary in first-occurrence order so that stable argsort over the counts
+# breaks ties the same way value_counts/nlargest do on the raw strings
+_COLOR_VOCAB = np.array(list(dict.fromkeys(
+    color
+    for row in _PRECOMPUTED_ROWS
+    for color in row['Upper_Wear_Colors'].split(', '))))
+_COLOR_CODE_MAP = {color: code for code, color in enumerate(_COLOR_VOCAB)}
+_COLOR_MATRIX = np.array([[_COLOR_CODE_MAP[color]
+                           for color in row['Upper_Wear_Colors'].split(', ')]
+                          for row in _PRECOMPUTED_ROWS], dtype=np.int16)
+_SAMPLE_DF.attrs['color_matrix'] = _COLOR_MATRIX
+_SAMPLE_DF.attrs['color_vocab'] = _COLOR_VOCAB
+
 def create_sample_dataset():
     """Create a comprehensive sample dataset for training"""
-    
-    # Sample data representing different skin tones and their color preferences
-    sample_data = []
-    
-    # Generate data for each skin tone level
-    for level in range(1, 11):
-        tone_info = SKIN_TONE_SCALE[level]
-        tone_name = tone_info['name']
-        
-        # For each undertone type
-        for undertone in ['warm', 'cool', 'neutral']:
-            upper_wear_colors = get_upper_wear_recommendations(undertone)
-            outfit_examples = get_outfit_examples(undertone)
-            
-            sample_data.append({
-                'Skin_Tone_Name': tone_name,
-                'Skin_Tone_Level': level,
-                'Undertone_Type': undertone,
-                'Upper_Wear_Colors': ', '.join(upper_wear_colors),
-                'Example_Outfit_Ideas': ' | '.join(outfit_examples)
-            })
-    
-    return pd.DataFrame(sample_data)
+    # Return a copy so callers can mutate their frame without touching the
+    # precomputed one
+    return _SAMPLE_DF.copy()
 
 def process_color_palette_data(df):
     """Process and clean the color palette dataset"""
     
-    # Data cleaning and preprocessing
-    df_cleaned = df.copy()
-    
-    # Remove any null values
-    df_cleaned = df_cleaned.dropna()
+    # Remove any null values; dropna already returns a new frame, so no
+    # extra up-front copy of the input is needed
+    df_cleaned = df.dropna()
     
     # Standardize text formatting
     df_cleaned['Skin_Tone_Name'] = df_cleaned['Skin_Tone_Name'].str.title()
     df_cleaned['Undertone_Type'] = df_cleaned['Undertone_Type'].str.lower()
-    
-    # Split color lists for analysis
-    df_cleaned['Color_Count'] = df_cleaned['Upper_Wear_Colors'].apply(
-        lambda x: len(x.split(', ')) if pd.notna(x) else 0
+
+    # Low-cardinality columns as categories and the 1-10 level as int8: an
+    # order of magnitude less memory, and groupby can work on the codes
+    df_cleaned['Skin_Tone_Name'] = df_cleaned['Skin_Tone_Name'].astype('category')
+    df_cleaned['Undertone_Type'] = df_cleaned['Undertone_Type'].astype('category')
+    df_cleaned['Skin_Tone_Level'] = df_cleaned['Skin_Tone_Level'].astype('int8')
+    
+    # Split color lists for analysis (vectorized separator count, no per-row apply)
+    df_cleaned['Color_Count'] = (
+        df_cleaned['Upper_Wear_Colors'].str.count(', ').add(1)
+        .where(df_cleaned['Upper_Wear_Colors'].notna(), 0)
+        .astype('int16')
     )
     
     return df_cleaned
@@ -189,33 +393,62 @@ def process_color_palette_data(df):
 def analyze_color_preferences(df):
     """Analyze color preferences across different skin tones"""
     
-    analysis_results = {}
-    
-    # Group by skin tone level
-    for level in df['Skin_Tone_Level'].unique():
-        level_data = df[df['Skin_Tone_Level'] == level]
-        
-        # Get most common colors for this skin tone level
-        all_colors = []
-        for colors_str in level_data['Upper_Wear_Colors']:
-            if pd.notna(colors_str):
-                all_colors.extend([color.strip() for color in colors_str.split(',')])
-        
-        color_counts = pd.Series(all_colors).value_counts()
-        
-        analysis_results[level] = {
-            'skin_tone_name': level_data['Skin_Tone_Name'].iloc[0],
-            'most_popular_colors': color_counts.head(5).to_dict(),
-            'total_combinations': len(level_data)
+    # One grouped pass for the per-level metadata instead of filtering the
+    # frame and taking .iloc[0] once per level
+    grouped = df.groupby('Skin_Tone_Level', sort=False)
+    tone_names = grouped['Skin_Tone_Name'].first()
+    totals = grouped.size()
+
+    color_matrix = df.attrs.get('color_matrix')
+    color_vocab = df.attrs.get('color_vocab')
+    top_colors = {}
+    if color_matrix is not None:
+        # Fast path: count color codes for each level's rows with bincount
+        for level, row_labels in grouped.groups.items():
+            counts = np.bincount(color_matrix[row_labels].ravel(),
+                                 minlength=len(color_vocab))
+            top_idx = np.argsort(-counts, kind='stable')[:5]
+            top_colors[level] = dict(zip(color_vocab[top_idx].tolist(),
+                                         counts[top_idx].tolist()))
+    else:
+        # Fallback for frames built without the color-code matrix: explode the
+        # color lists once and count every (level, color) pair in one groupby
+        exploded = (df[df['Upper_Wear_Colors'].notna()]
+                    .assign(_color=lambda d: d['Upper_Wear_Colors'].str.split(', '))
+                    .explode('_color'))
+        pair_counts = exploded.groupby(['Skin_Tone_Level', '_color'], sort=False).size()
+        top = pair_counts.groupby(level=0, sort=False).nlargest(5).droplevel(0)
+        for level in tone_names.index:
+            top_colors[level] = top.loc[level].to_dict() if level in top.index else {}
+
+    return {
+        level: {
+            'skin_tone_name': tone_names[level],
+            'most_popular_colors': top_colors[level],
+            'total_combinations': int(totals[level])
         }
-    
-    return analysis_results
+        for level in tone_names.index
+    }
 
 def visualize_skin_tone_distribution(df):
     """Create visualizations for skin tone and color analysis"""
-    
-    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-    
+
+    # Reuse one figure across calls instead of reallocating the ~10MB of
+    # pixel buffers a fresh 15x12 figure costs; rebuild it once the cached
+    # figure has been closed (e.g. the user dismissed the shown window)
+    cached = getattr(visualize_skin_tone_distribution, '_fig_cache', None)
+    if cached is None or not plt.fignum_exists(cached[0].number):
+        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+        visualize_skin_tone_distribution._fig_cache = (fig, axes)
+    else:
+        fig, axes = cached
+        # Clearing only the four subplots is not enough: sns.heatmap shrinks
+        # its panel and appends a fresh colorbar axes every call, so reset the
+        # whole canvas and lay the grid out again
+        fig.clf()
+        axes = fig.subplots(2, 2)
+        visualize_skin_tone_distribution._fig_cache = (fig, axes)
+
     # 1. Skin Tone Level Distribution
     skin_tone_counts = df['Skin_Tone_Level'].value_counts().sort_index()
     axes[0, 0].bar(skin_tone_counts.index, skin_tone_counts.values, color='skyblue')
@@ -237,18 +470,41 @@ def visualize_skin_tone_distribution(df):
     
     # 4. Skin Tone vs Undertone Heatmap
     heatmap_data = df.groupby(['Skin_Tone_Level', 'Undertone_Type']).size().unstack(fill_value=0)
-    sns.heatmap(heatmap_data, annot=True, fmt='d', cmap='YlOrRd', ax=axes[1, 1])
+    sns.heatmap(heatmap_data, annot=True, fmt='d', cmap='YlOrRd', ax=axes[1, 1],
+                vmin=0, vmax=heatmap_data.values.max())
     axes[1, 1].set_title('Skin Tone Level vs Undertone Type')
     
-    plt.tight_layout()
+    fig.tight_layout()
     plt.show()
 
-def export_recommendations_csv(df, filename='chromatone_recommendations.csv'):
-    """Export the processed dataset to CSV"""
-    df.to_csv(filename, index=False)
+def export_recommendations(df, filename='chromatone_recommendations.parquet',
+                           format='parquet'):
+    """Export the processed dataset as parquet (default) or CSV"""
+    if format == 'parquet':
+        # Dict-encoded strings + zstd: much faster to write and ~5x smaller
+        # than the escaped-CSV representation. The color-matrix attrs are
+        # NumPy arrays, which pandas cannot embed in parquet metadata, so
+        # write through a shallow copy without them.
+        out = df.copy(deep=False)
+        out.attrs = {}
+        out.to_parquet(filename, engine='pyarrow', compression='zstd')
+    elif format == 'csv':
+        # Route the long text columns through Arrow-backed strings so to_csv
+        # skips the per-cell Python object escaping path
+        df = df.assign(
+            Upper_Wear_Colors=df['Upper_Wear_Colors'].astype('string[pyarrow]'),
+            Example_Outfit_Ideas=df['Example_Outfit_Ideas'].astype('string[pyarrow]')
+        )
+        df.to_csv(filename, index=False)
+    else:
+        raise ValueError(f"Unsupported export format: {format}")
     print(f"Dataset exported to {filename}")
     return filename
 
+def export_recommendations_csv(df, filename='chromatone_recommendations.csv'):
+    """Export the processed dataset to CSV"""
+    return export_recommendations(df, filename, format='csv')
+
 # ===== MAIN EXECUTION =====
 
 def main():
@@ -0,0 +1,20 @@
+# Tests for the ChromaTone analysis helpers
+
+import ChromaTone_Python_Code as ct
+
+
+def test_color_preference_paths_agree():
+    """The bincount fast path and the string fallback give identical results"""
+    df = ct.process_color_palette_data(ct.create_sample_dataset())
+    fast = ct.analyze_color_preferences(df)
+
+    stripped = df.copy()
+    stripped.attrs = {}
+    fallback = ct.analyze_color_preferences(stripped)
+
+    assert fast == fallback
+
+
+if __name__ == "__main__":
+    test_color_preference_paths_agree()
+    print("ok")